@@ -1,6 +1,11 @@
 import re
+import hashlib
 import json
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
 import numpy as np
@@ -18,6 +23,7 @@ warnings.filterwarnings("ignore", category=FutureWarning, module="numpy")
 warnings.filterwarnings("ignore", category=FutureWarning, module="dowhy")
 
 import requests
+import urllib3
 from io import BytesIO
 
 try:
@@ -29,8 +35,15 @@ except Exception as _e:
     DOWHY_AVAILABLE = False
     DOWHY_IMPORT_ERROR = _e
 
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
 import networkx as nx
 import plotly.express as px
+import plotly.graph_objects as go
 from statsmodels.nonparametric.smoothers_lowess import lowess
 
 from utils.synthetic import generate_media_marketing_data
@@ -59,26 +72,95 @@ def _init_session_state() -> None:
         "treatment": None,
         "outcome": None,
         "confounders": [],
+        "refute_sims": 20,
+        "refute_mc_sims": 50,
         "results": None,
         "df": None,
     }
+    # Re-seeded every rerun (no "initialized" sentinel): Streamlit drops the
+    # state of keyed widgets that weren't rendered on the previous run, e.g.
+    # the synthetic-data inputs while another data source is selected.
     for k, v in defaults.items():
-        if k not in st.session_state:
-            st.session_state[k] = v
+        st.session_state.setdefault(k, v)
+
+
+_GS_ID_RE = re.compile(r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9_-]+)")
+_GS_GID_RE = re.compile(r"gid=(\d+)")
 
 
 def _convert_google_sheet_to_csv_url(link: str) -> Optional[str]:
     if not link:
         return None
-    m = re.search(r"docs.google.com/spreadsheets/d/([a-zA-Z0-9-_]+)", link)
+    m = _GS_ID_RE.search(link)
     if not m:
         return None
     sheet_id = m.group(1)
-    gid_match = re.search(r"gid=(\d+)", link)
+    gid_match = _GS_GID_RE.search(link)
     gid = gid_match.group(1) if gid_match else "0"
     return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
 
 
+def _c_engine_column_names(columns) -> List[str]:
+    """Name blank/duplicate headers the way the C parser does.
+
+    The pyarrow engine keeps them as-is ('' and repeats), which st.dataframe
+    rejects; the source may be a consumed stream, so rename instead of re-reading.
+    """
+    names = [f"Unnamed: {i}" if str(c).strip() == "" else str(c) for i, c in enumerate(columns)]
+    seen = set(names)
+    counts = {}
+    out = []
+    for name in names:
+        if name in counts:
+            k = counts[name]
+            while f"{name}.{k}" in seen:
+                k += 1
+            new = f"{name}.{k}"
+            counts[name] = k + 1
+            seen.add(new)
+            out.append(new)
+        else:
+            counts[name] = 1
+            out.append(name)
+    return out
+
+
+def _read_csv(source) -> pd.DataFrame:
+    """pd.read_csv using the multi-threaded pyarrow engine when it is installed."""
+    if PYARROW_AVAILABLE:
+        df = pd.read_csv(source, engine="pyarrow")
+        if df.columns.duplicated().any() or any(str(c).strip() == "" for c in df.columns):
+            df.columns = _c_engine_column_names(df.columns)
+        return df
+    return pd.read_csv(source)
+
+
+@st.cache_data(show_spinner=False)
+def _read_uploaded_csv(file_bytes: bytes, name: str) -> pd.DataFrame:
+    """Parse uploaded CSV bytes; cached on content so reruns skip re-parsing."""
+    return _read_csv(BytesIO(file_bytes))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_synth(
+    n: int,
+    channels: Tuple[str, ...],
+    season: bool,
+    price: bool,
+    noise: float,
+    seed: int,
+) -> pd.DataFrame:
+    """Synthetic data keyed on its generation parameters (channels as a tuple)."""
+    return generate_media_marketing_data(
+        num_rows=n,
+        channels=list(channels),
+        include_seasonality=season,
+        include_price=price,
+        noise_scale=noise,
+        random_seed=seed,
+    )
+
+
 def _load_data_from_source(center_ui) -> Tuple[Optional[pd.DataFrame], str]:
     source = center_ui.radio(
         "Data source",
@@ -92,7 +174,7 @@ def _load_data_from_source(center_ui) -> Tuple[Optional[pd.DataFrame], str]:
         uploaded = center_ui.file_uploader("Upload CSV", type=["csv"], key="csv_upload") 
         if uploaded is None:
             return None, source
-        return pd.read_csv(uploaded), source
+        return _read_uploaded_csv(uploaded.getvalue(), uploaded.name), source
 
     if source == "Google Sheets Link":
         link = center_ui.text_input("Paste Google Sheets share link", key="gs_link", placeholder="https://docs.google.com/spreadsheets/d/...")
@@ -104,7 +186,7 @@ def _load_data_from_source(center_ui) -> Tuple[Optional[pd.DataFrame], str]:
             return None, source
         try:
             with st.spinner("Loading Google Sheet as CSV (timeout 15s)..."):
-                df = _fetch_csv_with_timeout(csv_url, timeout_s=15, max_retries=1)
+                df = _cached_fetch_csv(csv_url, timeout_s=15, max_retries=1)
             return df, source
         except Exception as e:
             center_ui.error(f"Failed to load sheet as CSV: {e}")
@@ -125,48 +207,135 @@ def _load_data_from_source(center_ui) -> Tuple[Optional[pd.DataFrame], str]:
     if len(channels) == 0:
         center_ui.warning("Select at least one media channel")
         return None, source
-    return generate_media_marketing_data(
-        num_rows=int(n),
-        channels=channels,
-        include_seasonality=seasonality,
-        include_price=price_on,
-        noise_scale=float(noise),
-        random_seed=int(seed),
+    return _cached_synth(
+        int(n),
+        tuple(channels),
+        bool(seasonality),
+        bool(price_on),
+        float(noise),
+        int(seed),
     ), source
 
 
 # ---------- DOWHY PIPELINE ----------
 
-def _build_graph(treatment: str, outcome: str, confounders: List[str]) -> nx.DiGraph:
+@lru_cache(maxsize=32)
+def _build_graph_cached(treatment: str, outcome: str, conf_tuple: Tuple[str, ...]) -> nx.DiGraph:
     g = nx.DiGraph()
     g.add_node(treatment)
     g.add_node(outcome)
     g.add_edge(treatment, outcome)
-    for c in confounders:
+    for c in conf_tuple:
         g.add_node(c)
         g.add_edge(c, treatment)
         g.add_edge(c, outcome)
     return g
 
 
-def _run_dowhy(df: pd.DataFrame, treatment: str, outcome: str, confounders: List[str]):
-    if not DOWHY_AVAILABLE:
-        raise RuntimeError(f"DoWhy not available: {DOWHY_IMPORT_ERROR}")
-    graph = _build_graph(treatment, outcome, confounders)
+def _build_graph(treatment: str, outcome: str, confounders: List[str]) -> nx.DiGraph:
+    # Hand out a copy so callers (and DoWhy) can't mutate the cached graph
+    return _build_graph_cached(treatment, outcome, tuple(confounders)).copy()
+
+
+def _downcast(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Copy of df with low-cardinality text confounders stored as category.
+
+    Only the listed (confounder) columns are touched. Numeric columns keep
+    their dtype: casting float64 confounders to float32 shifts the propensity
+    estimates, so the reported effects would no longer match a full-precision fit.
+    """
+    out = df.copy()
+    for c in columns:
+        col = out[c]
+        if (
+            (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col))
+            and len(col)
+            and col.nunique() / len(col) < 0.5
+        ):
+            out[c] = col.astype("category")
+    return out
+
+
+def _graph_to_dot(g: nx.DiGraph) -> str:
+    """Serialize a small DAG to DOT text without going through pydot."""
+    def q(name) -> str:
+        return '"' + str(name).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    lines = ["digraph G {"]
+    lines += [f"  {q(n)};" for n in g.nodes()]
+    lines += [f"  {q(u)} -> {q(v)};" for u, v in g.edges()]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _df_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a dataframe, used as a cache key.
+
+    Computed once per rerun (see ``st.session_state["_df_hash"]``) and passed
+    explicitly to cached functions, which skip hashing the frame itself.
+    """
+    h = hashlib.sha1()
+    # Row hashes ignore column names and dtypes, so fold those in too: the same
+    # values under reordered/renamed columns must not share a key.
+    h.update(repr(tuple(map(str, df.columns))).encode())
+    h.update(repr(tuple(map(str, df.dtypes))).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def _skip_hash(_obj) -> bytes:
+    """hash_funcs entry for arguments already covered by an explicit df_hash."""
+    return b""
+
+
+@st.cache_resource(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _skip_hash})
+def _get_causal_model(df_hash: str, df: pd.DataFrame, treatment: str, outcome: str, conf_tuple: Tuple[str, ...]):
+    """Build the CausalModel and identify the effect once per dataset/spec.
+
+    Cached as a resource because CausalModel is not picklable; callers must
+    not mutate the returned objects.
+    """
+    graph = _build_graph(treatment, outcome, list(conf_tuple))
     model = CausalModel(
-        data=df,
+        data=_downcast(df, list(conf_tuple)),
         treatment=treatment,
         outcome=outcome,
         graph=graph,
     )
-
     identified = model.identify_effect()
-    estimate = model.estimate_effect(
+    return model, graph, identified
+
+
+@st.cache_resource(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _skip_hash})
+def _get_linear_estimate(df_hash: str, df: pd.DataFrame, treatment: str, outcome: str, conf_tuple: Tuple[str, ...]):
+    """Backdoor linear-regression estimate on the cached model.
+
+    Cached as a resource alongside the model so the Refutations tab can reuse
+    it without refitting; callers must not mutate it.
+    """
+    model, _graph, identified = _get_causal_model(df_hash, df, treatment, outcome, conf_tuple)
+    return model.estimate_effect(
         identified,
         method_name="backdoor.linear_regression",
         confidence_intervals=True,
     )
-    refute = model.refute_estimate(identified, estimate, method_name="random_common_cause")
+
+
+def _run_dowhy(df: pd.DataFrame, treatment: str, outcome: str, confounders: List[str], num_simulations: int = 20, df_hash: Optional[str] = None):
+    if not DOWHY_AVAILABLE:
+        raise RuntimeError(f"DoWhy not available: {DOWHY_IMPORT_ERROR}")
+    if df_hash is None:
+        df_hash = _df_fingerprint(df)
+    model, graph, identified = _get_causal_model(df_hash, df, treatment, outcome, tuple(confounders))
+    estimate = _get_linear_estimate(df_hash, df, treatment, outcome, tuple(confounders))
+    refute = model.refute_estimate(
+        identified,
+        estimate,
+        method_name="random_common_cause",
+        # dowhy>=0.10 forwards refuter options as keyword arguments; a
+        # method_params dict is silently ignored
+        num_simulations=num_simulations,
+    )
     return graph, identified, estimate, refute, model
 
 
@@ -290,23 +459,52 @@ def _interpret_estimate(estimate_value: float, treatment: str, outcome: str, ci_
     return interpretation
 
 
-def _interpret_refutation(refute_str: str, original_estimate: float, refuter_type: str = "generic") -> str:
-    """Extract key info from refutation result and interpret."""
-    lines = refute_str.split('\n')
-    new_effect = None
-    p_value = None
-    
-    for line in lines:
-        if 'New effect:' in line:
-            try:
-                new_effect = float(line.split(':')[-1].strip())
-            except:
-                pass
-        if 'p value:' in line:
-            try:
-                p_value = float(line.split(':')[-1].strip())
-            except:
-                pass
+# Numeric "<label>: <value>" lines in DoWhy's estimate/refutation text output
+_EST_RE = re.compile(
+    r"^\s*(Mean value|ATE|New effect|p value)\s*:\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)",
+    re.M,
+)
+_EST_FIELDS = {"Mean value": "mean", "ATE": "mean", "New effect": "new_effect", "p value": "p_value"}
+
+
+def _parse_dowhy(text: str) -> dict:
+    """Extract mean / new_effect / p_value from DoWhy text output in one regex pass."""
+    out = {"mean": None, "new_effect": None, "p_value": None}
+    for m in _EST_RE.finditer(text or ""):
+        key = _EST_FIELDS[m.group(1)]
+        if out[key] is None:
+            out[key] = float(m.group(2))
+    return out
+
+
+def _refutation_values(refute) -> Tuple[Optional[float], Optional[float]]:
+    """Extract (new_effect, p_value) from a DoWhy refutation or its text output.
+
+    Reads the structured ``new_effect`` / ``refutation_result`` attributes and
+    only renders and parses the text when those are missing.
+    """
+    if isinstance(refute, str):
+        parsed = _parse_dowhy(refute)
+        return parsed["new_effect"], parsed["p_value"]
+    if isinstance(refute, dict):
+        # Persisted entry from the Refutations tab's refuter_cache
+        return refute.get("new_effect"), refute.get("p_value")
+    new_effect = getattr(refute, "new_effect", None)
+    p_value = (getattr(refute, "refutation_result", None) or {}).get("p_value")
+    try:
+        new_effect = float(new_effect) if new_effect is not None else None
+        p_value = float(p_value) if p_value is not None else None
+    except (TypeError, ValueError):
+        new_effect, p_value = None, None
+    if new_effect is None or p_value is None:
+        parsed = _parse_dowhy(str(refute))
+        return parsed["new_effect"], parsed["p_value"]
+    return new_effect, p_value
+
+
+def _interpret_refutation(refute, original_estimate: float, refuter_type: str = "generic") -> str:
+    """Extract key info from refutation result (object, text or cached entry) and interpret."""
+    new_effect, p_value = _refutation_values(refute)
     
     if new_effect is None or p_value is None:
         return "Could not parse refutation results."
@@ -370,17 +568,57 @@ def _interpret_refutation(refute_str: str, original_estimate: float, refuter_typ
     return interpretation
 
 
+# Upper bound on points fed to the scatter trace and the O(n^2) LOWESS smoother
+_MAX_PLOT_POINTS = 5000
+
+
 def _plot_response_curves(df: pd.DataFrame, treatment: str, outcome: str, estimate_value=None, ci_lower=None, ci_upper=None):
-    fig_scatter = px.scatter(df, x=treatment, y=outcome, opacity=0.3, trendline="ols")
-    fig_scatter.update_layout(title=f"{treatment} vs {outcome}")
+    # Scatter and LOWESS run on a uniform sample for large frames; the
+    # histogram below is binned on the full data server-side.
+    if len(df) > _MAX_PLOT_POINTS:
+        idx = np.random.default_rng(0).choice(len(df), _MAX_PLOT_POINTS, replace=False)
+        sample = df.iloc[idx]
+    else:
+        sample = df
+
+    x = sample[treatment].to_numpy(copy=False)
+    y = sample[outcome].to_numpy(copy=False)
+
+    # WebGL trace: the browser renders thousands of markers without SVG nodes
+    fig_scatter = go.Figure(go.Scattergl(x=x, y=y, mode="markers", marker=dict(opacity=0.3)))
+    fig_scatter.update_layout(title=f"{treatment} vs {outcome}", xaxis_title=treatment, yaxis_title=outcome)
+    # Overlay the estimated effect as a line through the data centroid rather
+    # than refitting an OLS trendline on every render
+    if estimate_value is not None and len(x):
+        intercept = float(y.mean()) - estimate_value * float(x.mean())
+        x_min, x_max = float(x.min()), float(x.max())
+        fig_scatter.add_shape(
+            type="line",
+            x0=x_min,
+            x1=x_max,
+            y0=intercept + estimate_value * x_min,
+            y1=intercept + estimate_value * x_max,
+            line=dict(color="red"),
+        )
 
     # LOWESS smooth as a non-parametric response curve
-    x = df[treatment].values
-    y = df[outcome].values
-    sm = lowess(y, x, frac=0.2, it=0, return_sorted=True)
+    # delta lets lowess interpolate between nearby x values instead of fitting
+    # a local regression at every point. Work on a float view so bool/int
+    # treatments (binary treatments for the propensity estimators) are fine.
+    xf = x.astype(float, copy=False)
+    dx = float(np.nanmax(xf) - np.nanmin(xf)) if len(xf) else 0.0
+    sm = lowess(y, xf, frac=0.2, it=0, delta=0.01 * dx, return_sorted=True)
     fig_lowess = px.line(x=sm[:,0], y=sm[:,1], labels={"x": treatment, "y": outcome}, title="LOWESS response curve")
 
-    dist = px.histogram(df, x=treatment, nbins=40, title=f"Distribution of {treatment}")
+    # Send bin counts instead of every raw value to the browser
+    values = df[treatment].dropna()
+    if pd.api.types.is_numeric_dtype(values) and len(values):
+        nbins = max(1, min(100, int(np.sqrt(len(values)))))
+        counts, edges = np.histogram(values.to_numpy(copy=False), bins=nbins)
+        dist = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+        dist.update_layout(title=f"Distribution of {treatment}", xaxis_title=treatment, yaxis_title="count", bargap=0)
+    else:
+        dist = px.histogram(df, x=treatment, nbins=40, title=f"Distribution of {treatment}")
     
     # Add estimate visualization with CI if available
     fig_estimate = None
@@ -406,6 +644,12 @@ def _plot_response_curves(df: pd.DataFrame, treatment: str, outcome: str, estima
     return fig_scatter, fig_lowess, dist, fig_estimate
 
 
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _skip_hash})
+def _cached_plots(df_hash: str, df: pd.DataFrame, treatment: str, outcome: str, estimate_value=None, ci_lower=None, ci_upper=None):
+    """Cached _plot_response_curves so tab switches don't rebuild the figures."""
+    return _plot_response_curves(df, treatment, outcome, estimate_value, ci_lower, ci_upper)
+
+
 def _run_refuter_with_fallbacks(model, identified, estimate, method_name: str, attempts: list):
     """Try running a refuter with several parameter sets until one works."""
     last_err = None
@@ -418,6 +662,17 @@ def _run_refuter_with_fallbacks(model, identified, estimate, method_name: str, a
     raise last_err
 
 
+def _refute_entry(model, identified, estimate, method_name: str, method_params: dict) -> dict:
+    """Run one refuter and keep only what the Refutations tab displays.
+
+    Makes no Streamlit calls, so it can run on a worker thread.
+    """
+    # Refuter options must be keyword arguments; dowhy>=0.10 ignores method_params
+    r = model.refute_estimate(identified, estimate, method_name=method_name, **method_params)
+    new_effect, p_value = _refutation_values(r)
+    return {"raw": str(r), "new_effect": new_effect, "p_value": p_value}
+
+
 # Estimator mapping for selection
 ESTIMATOR_MAP = {
     "Linear regression": "backdoor.linear_regression",
@@ -427,6 +682,19 @@ ESTIMATOR_MAP = {
 }
 
 
+def _estimate_value(est):
+    """Numeric effect of a DoWhy estimate: structured attributes first, text only as a fallback."""
+    value = getattr(est, "value", None)
+    if value is None:
+        for attr in ("estimate", "causal_estimate"):
+            if hasattr(est, attr):
+                value = getattr(est, attr)
+                break
+    if value is None:
+        value = _parse_dowhy(str(est))["mean"]
+    return value
+
+
 def _run_estimator(model, identified, method_name: str):
     est = model.estimate_effect(
         identified,
@@ -436,22 +704,7 @@ def _run_estimator(model, identified, method_name: str):
     ci = _get_confidence_intervals(est)
     ci_lower = ci[0] if ci is not None else None
     ci_upper = ci[1] if ci is not None else None
-    # value extraction
-    value = None
-    for attr in ("value", "estimate", "causal_estimate"):
-        if hasattr(est, attr):
-            value = getattr(est, attr)
-            break
-    if value is None:
-        est_str = str(est)
-        for line in est_str.split('\n'):
-            if 'Mean value:' in line or 'ATE:' in line:
-                try:
-                    value = float(line.split(':')[-1].strip())
-                    break
-                except:
-                    pass
-    return est, value, ci_lower, ci_upper
+    return est, _estimate_value(est), ci_lower, ci_upper
 
 
 def _significant(ci_lower, ci_upper) -> Optional[bool]:
@@ -460,94 +713,402 @@ def _significant(ci_lower, ci_upper) -> Optional[bool]:
     return not (ci_lower <= 0 <= ci_upper)
 
 
-def _run_estimators_comparison(df: pd.DataFrame, treatment: str, outcome: str, confounders: List[str], estimator_labels: List[str]):
-    graph = _build_graph(treatment, outcome, confounders)
-    model = CausalModel(
-        data=df,
-        treatment=treatment,
-        outcome=outcome,
-        graph=graph,
-    )
-    identified = model.identify_effect()
+def _run_single_estimator(model, identified, label: str, num_simulations: int = 20):
+    """Fit one estimator plus its random-common-cause refutation."""
+    method = ESTIMATOR_MAP[label]
+    try:
+        est, value, ci_l, ci_u = _run_estimator(model, identified, method)
+        # refute per estimator (random common cause)
+        try:
+            r = model.refute_estimate(identified, est, method_name="random_common_cause", num_simulations=num_simulations)
+            r_str = str(r)
+            new_effect, p_value = _refutation_values(r)
+            delta_pct = None
+            if value is not None and new_effect is not None and value != 0:
+                delta_pct = abs((new_effect - value) / value * 100)
+        except Exception as e:
+            r_str = f"Refutation failed: {e}"
+            new_effect = None
+            p_value = None
+            delta_pct = None
+
+        row = {
+            "Estimator": label,
+            "ATE": value,
+            "CI Lower": ci_l,
+            "CI Upper": ci_u,
+            "Significant": _significant(ci_l, ci_u),
+            "Refute New": new_effect,
+            "Refute p": p_value,
+            "Delta %": delta_pct,
+        }
+        detail = {
+            "estimate_str": str(est),
+            "refute_str": r_str,
+        }
+    except Exception as e:
+        row = {
+            "Estimator": label,
+            "ATE": None,
+            "CI Lower": None,
+            "CI Upper": None,
+            "Significant": None,
+            "Refute New": None,
+            "Refute p": None,
+            "Delta %": None,
+            "Error": str(e),
+        }
+        detail = {"error": str(e)}
+    return label, row, detail
+
+
+def _run_estimators_comparison(df: pd.DataFrame, treatment: str, outcome: str, confounders: List[str], estimator_labels: List[str], num_simulations: int = 20, df_hash: Optional[str] = None):
+    if df_hash is None:
+        df_hash = _df_fingerprint(df)
+    model, graph, identified = _get_causal_model(df_hash, df, treatment, outcome, tuple(confounders))
 
     rows = []
     details = {}
-    for label in estimator_labels:
-        method = ESTIMATOR_MAP[label]
-        try:
-            est, value, ci_l, ci_u = _run_estimator(model, identified, method)
-            # refute per estimator (random common cause)
-            try:
-                r = model.refute_estimate(identified, est, method_name="random_common_cause", method_params={"num_simulations": 50})
-                r_str = str(r)
-                # parse
-                new_effect = None
-                p_value = None
-                for line in r_str.split('\n'):
-                    if 'New effect:' in line:
-                        try:
-                            new_effect = float(line.split(':')[-1].strip())
-                        except:
-                            pass
-                    if 'p value:' in line:
-                        try:
-                            p_value = float(line.split(':')[-1].strip())
-                        except:
-                            pass
-                delta_pct = None
-                if value is not None and new_effect is not None and value != 0:
-                    delta_pct = abs((new_effect - value) / value * 100)
-            except Exception as e:
-                r_str = f"Refutation failed: {e}"
-                new_effect = None
-                p_value = None
-                delta_pct = None
-
-            rows.append({
-                "Estimator": label,
-                "ATE": value,
-                "CI Lower": ci_l,
-                "CI Upper": ci_u,
-                "Significant": _significant(ci_l, ci_u),
-                "Refute New": new_effect,
-                "Refute p": p_value,
-                "Delta %": delta_pct,
-            })
-            details[label] = {
-                "estimate_str": str(est),
-                "refute_str": r_str,
-            }
-        except Exception as e:
-            rows.append({
-                "Estimator": label,
-                "ATE": None,
-                "CI Lower": None,
-                "CI Upper": None,
-                "Significant": None,
-                "Refute New": None,
-                "Refute p": None,
-                "Delta %": None,
-                "Error": str(e),
-            })
-            details[label] = {"error": str(e)}
+    if not estimator_labels:
+        return identified, rows, details, model, graph
+    # Estimators are independent and spend most of their time in numpy/sklearn/
+    # statsmodels code that releases the GIL, so threads give real overlap.
+    # DoWhy's propensity estimators write columns (propensity_score, d_y,
+    # dbar_y) into the model's data in place, so each worker fits on its own
+    # model over a freshly prepared copy (_downcast copies); the cached model
+    # is never mutated. The estimand only describes the graph and is shared.
+    def worker(label: str):
+        private = CausalModel(
+            data=_downcast(df, confounders),
+            treatment=treatment,
+            outcome=outcome,
+            graph=_build_graph(treatment, outcome, confounders),
+        )
+        return _run_single_estimator(private, identified, label, num_simulations)
+
+    with ThreadPoolExecutor(max_workers=len(estimator_labels)) as ex:
+        futures = [ex.submit(worker, label) for label in estimator_labels]
+        for fut in futures:
+            label, row, detail = fut.result()
+            rows.append(row)
+            details[label] = detail
 
     return identified, rows, details, model, graph
 
 
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _skip_hash})
+def _compute_comparison(df_hash: str, df: pd.DataFrame, treatment: str, outcome: str, conf_tuple: Tuple[str, ...], est_tuple: Tuple[str, ...], num_simulations: int = 20):
+    """Cached estimator comparison.
+
+    Only pickle-safe outputs (estimand text, rows, details) are returned; the
+    live CausalModel and graph are dropped.
+    """
+    identified, rows, details, _model, _graph = _run_estimators_comparison(
+        df, treatment, outcome, list(conf_tuple), list(est_tuple), num_simulations, df_hash
+    )
+    return str(identified), rows, details
+
+
+# HTTP statuses worth retrying; other 4xx responses fail immediately
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
 def _fetch_csv_with_timeout(url: str, timeout_s: int = 15, max_retries: int = 2) -> pd.DataFrame:
     last_err = None
     headers = {"User-Agent": "causalapp/1.0"}
-    for _ in range(max_retries + 1):
+    for i in range(max_retries + 1):
         try:
-            resp = requests.get(url, headers=headers, timeout=timeout_s)
-            resp.raise_for_status()
-            return pd.read_csv(BytesIO(resp.content))
-        except Exception as e:
+            # Stream the body straight into the parser instead of buffering
+            # resp.content and copying it into a BytesIO. Connect timeout is
+            # kept short so dead endpoints are detected quickly.
+            with requests.get(url, headers=headers, timeout=(3, timeout_s), stream=True) as resp:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                return _read_csv(resp.raw)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code not in _RETRYABLE_STATUS:
+                raise
             last_err = e
-            continue
+        except (
+            requests.Timeout,
+            requests.ConnectionError,
+            # Raised from resp.raw when the body stalls or drops mid-stream
+            urllib3.exceptions.ReadTimeoutError,
+            urllib3.exceptions.ProtocolError,
+        ) as e:
+            last_err = e
+        if i < max_retries:
+            # Exponential backoff with jitter
+            time.sleep(min(2 ** i + random.random(), 10))
     raise last_err
 
 
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_fetch_csv(url: str, timeout_s: int = 15, max_retries: int = 2) -> pd.DataFrame:
+    """Cached wrapper around the sheet download so reruns don't hit the network."""
+    return _fetch_csv_with_timeout(url, timeout_s=timeout_s, max_retries=max_retries)
+
+
+@st.fragment
+def _render_results_tab() -> None:
+    """Analysis tab; a fragment so its widgets rerun only this tab."""
+    st.subheader("Analysis")
+    res = st.session_state.get("results")
+    if not res:
+        st.info("Run the analysis on the Setup tab to see results here.")
+    else:
+        # Comparison summary table
+        compare_rows = res.get("compare_rows", [])
+        if compare_rows:
+            st.markdown("### 🧪 Estimator comparison")
+            import pandas as _pd
+            table_df = _pd.DataFrame(compare_rows)
+            # Order columns
+            cols_order = [c for c in ["Estimator","ATE","CI Lower","CI Upper","Significant","Refute New","Refute p","Delta %","Error"] if c in table_df.columns]
+            table_df = table_df[cols_order]
+            st.dataframe(table_df, width="stretch")
+
+            with st.expander("Estimator details"):
+                details = res.get("compare_details", {})
+                for label, info in details.items():
+                    st.markdown(f"**{label}**")
+                    if "error" in info:
+                        st.warning(info["error"])
+                    else:
+                        st.markdown("Estimate output")
+                        st.code(info.get("estimate_str",""))
+                        st.markdown("Refutation output")
+                        st.code(info.get("refute_str",""))
+
+        st.markdown("---")
+
+        # Existing interpretation + graph and details
+        estimate_val = res.get("estimate_value")
+
+        ci_lower = res.get("ci_lower")
+        ci_upper = res.get("ci_upper")
+
+        st.markdown("### 📊 Causal Effect Estimate")
+        if estimate_val is not None:
+            interpretation = _interpret_estimate(
+                estimate_val, 
+                res["treatment"], 
+                res["outcome"],
+                ci_lower,
+                ci_upper
+            )
+            st.markdown(interpretation)
+
+        if ci_lower is not None and ci_upper is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("ATE", f"{estimate_val:.4f}" if estimate_val else "N/A")
+            with col2:
+                st.metric("CI Lower", f"{ci_lower:.4f}")
+            with col3:
+                st.metric("CI Upper", f"{ci_upper:.4f}")
+
+        st.markdown("---")
+
+        left, right = st.columns([1, 1])
+        with left:
+            st.markdown("**Causal Graph**")
+            st.graphviz_chart(res["graph_dot"])
+            with st.expander("What is a causal graph?"):
+                st.markdown("""
+                A causal graph shows the relationships between variables:
+                - **Arrows (→)** indicate causal direction (e.g., Treatment → Outcome)
+                - **Confounders** affect both treatment and outcome (creates backdoor paths)
+                - **Backdoor paths** are alternative routes from treatment to outcome that must be blocked
+                """)
+
+            st.markdown("**Identified estimand**")
+            with st.expander("View detailed estimand", expanded=False):
+                st.code(res["identified"])
+            st.caption("The estimand shows what needs to be adjusted to estimate the causal effect.")
+        with right:
+            st.markdown("**Estimate Details**")
+            with st.expander("View full estimate output", expanded=False):
+                st.code(res["estimate"])
+
+            st.markdown("**Refutation Test**")
+            if estimate_val is not None:
+                refute_interp = _interpret_refutation(res["refute"], estimate_val, "random_common_cause")
+                st.markdown(refute_interp)
+            with st.expander("View raw refutation output", expanded=False):
+                st.code(res["refute"]) 
+
+        st.caption("Powered by DoWhy. See docs at https://www.pywhy.org/dowhy/v0.13/")
+
+
+@st.fragment
+def _render_visuals_tab() -> None:
+    """Visuals tab; a fragment so its widgets rerun only this tab."""
+    st.subheader("Visuals")
+    res = st.session_state.get("results")
+    df = st.session_state.get("df")
+    if not res or df is None:
+        st.info("Run the analysis on the Setup tab to populate visuals.")
+    else:
+        treatment = res["treatment"]
+        outcome = res["outcome"]
+        estimate_val = res.get("estimate_value")
+
+        ci_lower = res.get("ci_lower")
+        ci_upper = res.get("ci_upper")
+
+        # One cached build serves both sections below
+        fig1, fig2, fig3, fig_estimate = _cached_plots(st.session_state["_df_hash"], df, treatment, outcome, estimate_val, ci_lower, ci_upper)
+
+        # Show estimate with CI at the top
+        if estimate_val is not None:
+            st.markdown("### 📈 Causal Effect Visualization")
+            if fig_estimate:
+                st.plotly_chart(fig_estimate, use_container_width=True)
+                if ci_lower is not None and ci_upper is not None:
+                    st.caption(f"Error bars show 95% confidence interval: [{ci_lower:.4f}, {ci_upper:.4f}]")
+            st.markdown("---")
+
+        st.markdown("### 📊 Data Exploration")
+        st.plotly_chart(fig1, use_container_width=True)
+        if estimate_val is not None:
+            st.caption("Scatter plot of treatment vs outcome. The red line has slope equal to the estimated causal effect (ATE).")
+        else:
+            st.caption("Scatter plot showing the relationship between treatment and outcome.")
+
+        st.plotly_chart(fig2, use_container_width=True)
+        st.caption("LOWESS (Locally Weighted Scatterplot Smoothing) shows a non-parametric response curve.")
+
+        st.plotly_chart(fig3, use_container_width=True)
+        st.caption("Distribution of the treatment variable.")
+
+
+@st.fragment
+def _render_refute_tab() -> None:
+    """Refutations tab; a fragment so the refuter button reruns only this tab."""
+    st.subheader("Refutations")
+    res = st.session_state.get("results")
+    df = st.session_state.get("df")
+    if not res or df is None:
+        st.info("Run the analysis on the Setup tab to enable refutations.")
+    else:
+        treatment = res["treatment"]
+        outcome = res["outcome"]
+        confounders = res["confounders"]
+        sims = st.slider(
+            "Monte Carlo simulations",
+            10,
+            500,
+            st.session_state["refute_mc_sims"],
+            key="refute_mc_sims",
+        )
+        st.caption(
+            "Simulations per refuter (random common cause, placebo, bootstrap). Fewer runs faster; "
+            "estimates usually stabilise well below the maximum, but p-values get noisier at the low end."
+        )
+        if st.button("Run extra refuters", use_container_width=True):
+            # Reuse the cached model/estimand/estimate; only the refuters run here
+            df_hash = st.session_state["_df_hash"]
+            model, graph, identified = _get_causal_model(df_hash, df, treatment, outcome, tuple(confounders))
+            estimate = _get_linear_estimate(df_hash, df, treatment, outcome, tuple(confounders))
+
+            # Numeric value of the estimate being refuted (the current data's fit,
+            # which may differ from res if the data changed after Run)
+            estimate_val = _estimate_value(estimate)
+
+            refuter_summary = []
+            refuter_cache = st.session_state.setdefault("refuter_cache", {})
+
+            jobs = [
+                ("Random common cause", "random_common_cause", "random_common_cause", {"num_simulations": int(sims)}),
+                ("Placebo treatment", "placebo_treatment_refuter", "placebo_treatment", {"placebo_type": "permute", "num_simulations": int(sims)}),
+                ("Data subset", "data_subset_refuter", "data_subset", {"subset_fraction": 0.8, "num_simulations": 10}),
+                # Cap the resample size so each bootstrap iteration stays cheap on large frames
+                ("Bootstrap refuter", "bootstrap_refuter", "bootstrap", {"num_simulations": max(int(sims), 20), "sample_size": int(min(len(df) * 0.8, 20_000))}),
+            ]
+
+            def cache_key(method_name: str, method_params: dict):
+                # Same refuter on the same estimate (identified by the analysis spec)
+                return (method_name, tuple(sorted(method_params.items())), df_hash, treatment, outcome, tuple(confounders))
+
+            # Refuters not already cached are independent Monte Carlo loops, so run
+            # them concurrently; Streamlit calls stay on this thread below.
+            errors = {}
+            with st.spinner("Running refuters ..."):
+                with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+                    futures = {}
+                    for _, method_name, _, method_params in jobs:
+                        key = cache_key(method_name, method_params)
+                        if key not in refuter_cache:
+                            futures[key] = ex.submit(_refute_entry, model, identified, estimate, method_name, method_params)
+                    for key, fut in futures.items():
+                        try:
+                            refuter_cache[key] = fut.result()
+                        except Exception as e:
+                            errors[key] = e
+
+            def display(title: str, method_name: str, refuter_type: str, method_params: dict):
+                key = cache_key(method_name, method_params)
+                if key in errors:
+                    e = errors[key]
+                    st.warning(f"{title} skipped: {e}")
+                    refuter_summary.append({
+                        "Refuter": title,
+                        "Original": estimate_val,
+                        "New Effect": None,
+                        "Change %": None,
+                        "p-value": None,
+                        "Error": str(e),
+                    })
+                    return
+                entry = refuter_cache[key]
+                new_effect = entry["new_effect"]
+                p_value = entry["p_value"]
+
+                st.markdown(f"**{title}**")
+                # Narrative
+                if estimate_val is not None:
+                    interp = _interpret_refutation(entry, estimate_val, refuter_type)
+                    st.markdown(interp)
+                with st.expander("Raw output"):
+                    st.code(entry["raw"])
+
+                # Summary table
+                change_pct = None
+                if estimate_val is not None and new_effect is not None and estimate_val != 0:
+                    change_pct = abs((new_effect - estimate_val) / estimate_val * 100)
+
+                refuter_summary.append({
+                    "Refuter": title,
+                    "Original": estimate_val,
+                    "New Effect": new_effect,
+                    "Change %": change_pct,
+                    "p-value": p_value,
+                })
+
+            st.markdown("### 🔍 Robustness checks")
+            st.markdown("These tests perturb assumptions/data to check how stable the effect is. Each test checks a different aspect of robustness.")
+            for job in jobs:
+                display(*job)
+
+            if refuter_summary:
+                st.markdown("---")
+                st.markdown("### 📊 Refutation summary")
+                if PYARROW_AVAILABLE:
+                    # Hand Streamlit an Arrow table directly, skipping the pandas
+                    # round-trip. from_pylist infers columns from the first row
+                    # only, so pad every row to the full key set (e.g. "Error").
+                    columns = list(dict.fromkeys(k for row in refuter_summary for k in row))
+                    summary = pyarrow.Table.from_pylist([{c: row.get(c) for c in columns} for row in refuter_summary])
+                else:
+                    summary = pd.DataFrame(refuter_summary)
+                st.dataframe(
+                    summary,
+                    width="stretch",
+                    column_config={"Change %": st.column_config.NumberColumn("Change %", format="%.2f%%")},
+                )
+
+
 def main() -> None:
     _header()
     _init_session_state()
@@ -577,6 +1138,7 @@ def main() -> None:
             st.info("Provide data to continue.")
             st.stop()
         st.session_state["df"] = df
+        st.session_state["_df_hash"] = _df_fingerprint(df)
 
         st.dataframe(df.head(20), width="stretch")
 
@@ -662,6 +1224,14 @@ def main() -> None:
             default=estimator_labels,
             key="estimators_selected",
         )
+        refute_sims = st.slider(
+            "Refuter simulations",
+            10,
+            200,
+            st.session_state["refute_sims"],
+            key="refute_sims",
+            help="Simulations for the random-common-cause refuter run with each estimator. Fewer is faster; more gives a steadier p-value.",
+        )
 
         col_a, col_b = st.columns([1,1])
         with col_a:
@@ -671,15 +1241,33 @@ def main() -> None:
             if st.button("Run DoWhy Analysis", disabled=run_disabled, use_container_width=True):
                 with st.spinner("Running model → identify → estimate → refute ..."):
                     try:
-                        # Keep single-estimator run for backward compatibility
-                        graph, identified, estimate, refute, model = _run_dowhy(df, treatment, outcome, confounders)
                         # Comparison run across selected estimators
-                        identified2, rows, details, model2, graph2 = _run_estimators_comparison(df, treatment, outcome, confounders, selected_estimators)
+                        identified, rows, details = _compute_comparison(
+                            st.session_state["_df_hash"], df, treatment, outcome, tuple(confounders), tuple(selected_estimators), int(refute_sims)
+                        )
+                        # Single-estimator display reuses the comparison's linear regression
+                        # output; only run it separately if it wasn't selected or failed.
+                        linear = details.get("Linear regression", {})
+                        if "estimate_str" in linear:
+                            graph = _build_graph(treatment, outcome, confounders)
+                            estimate_str = linear["estimate_str"]
+                            refute_str = linear["refute_str"]
+                            estimate_value = next(r["ATE"] for r in rows if r["Estimator"] == "Linear regression")
+                        else:
+                            graph, identified, estimate, refute, model = _run_dowhy(df, treatment, outcome, confounders, int(refute_sims), st.session_state["_df_hash"])
+                            estimate_str = str(estimate)
+                            refute_str = str(refute)
+                            estimate_value = _estimate_value(estimate)
+                        if estimate_value is None:
+                            estimate_value = _parse_dowhy(estimate_str)["mean"]
                         st.session_state["results"] = {
                             "graph": graph,
+                            # DOT text rendered once here, not on every rerun of the Analysis tab
+                            "graph_dot": _graph_to_dot(graph),
                             "identified": str(identified),
-                            "estimate": str(estimate),
-                            "refute": str(refute),
+                            "estimate": estimate_str,
+                            "estimate_value": float(estimate_value) if estimate_value is not None else None,
+                            "refute": refute_str,
                             "treatment": treatment,
                             "outcome": outcome,
                             "confounders": confounders,
@@ -691,241 +1279,13 @@ def main() -> None:
                         st.error(f"Analysis failed: {e}")
 
     with analysis_tab:
-        st.subheader("Analysis")
-        res = st.session_state.get("results")
-        if not res:
-            st.info("Run the analysis on the Setup tab to see results here.")
-        else:
-            # Comparison summary table
-            compare_rows = res.get("compare_rows", [])
-            if compare_rows:
-                st.markdown("### 🧪 Estimator comparison")
-                import pandas as _pd
-                table_df = _pd.DataFrame(compare_rows)
-                # Order columns
-                cols_order = [c for c in ["Estimator","ATE","CI Lower","CI Upper","Significant","Refute New","Refute p","Delta %","Error"] if c in table_df.columns]
-                table_df = table_df[cols_order]
-                st.dataframe(table_df, width="stretch")
-                
-                with st.expander("Estimator details"):
-                    details = res.get("compare_details", {})
-                    for label, info in details.items():
-                        st.markdown(f"**{label}**")
-                        if "error" in info:
-                            st.warning(info["error"])
-                        else:
-                            st.markdown("Estimate output")
-                            st.code(info.get("estimate_str",""))
-                            st.markdown("Refutation output")
-                            st.code(info.get("refute_str",""))
-            
-            st.markdown("---")
-            
-            # Existing interpretation + graph and details
-            # Extract estimate value for interpretation
-            estimate_val = res.get("estimate_value")
-            if estimate_val is None:
-                # Try to extract from estimate string
-                est_str = res.get("estimate", "")
-                for line in est_str.split('\n'):
-                    if 'Mean value:' in line:
-                        try:
-                            estimate_val = float(line.split(':')[-1].strip())
-                            break
-                        except:
-                            pass
-            
-            ci_lower = res.get("ci_lower")
-            ci_upper = res.get("ci_upper")
-            
-            st.markdown("### 📊 Causal Effect Estimate")
-            if estimate_val is not None:
-                interpretation = _interpret_estimate(
-                    estimate_val, 
-                    res["treatment"], 
-                    res["outcome"],
-                    ci_lower,
-                    ci_upper
-                )
-                st.markdown(interpretation)
-            
-            if ci_lower is not None and ci_upper is not None:
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("ATE", f"{estimate_val:.4f}" if estimate_val else "N/A")
-                with col2:
-                    st.metric("CI Lower", f"{ci_lower:.4f}")
-                with col3:
-                    st.metric("CI Upper", f"{ci_upper:.4f}")
-            
-            st.markdown("---")
-            
-            left, right = st.columns([1, 1])
-            with left:
-                st.markdown("**Causal Graph**")
-                st.graphviz_chart(nx.nx_pydot.to_pydot(res["graph"]).to_string())
-                with st.expander("What is a causal graph?"):
-                    st.markdown("""
-                    A causal graph shows the relationships between variables:
-                    - **Arrows (→)** indicate causal direction (e.g., Treatment → Outcome)
-                    - **Confounders** affect both treatment and outcome (creates backdoor paths)
-                    - **Backdoor paths** are alternative routes from treatment to outcome that must be blocked
-                    """)
-                
-                st.markdown("**Identified estimand**")
-                with st.expander("View detailed estimand", expanded=False):
-                    st.code(res["identified"])
-                st.caption("The estimand shows what needs to be adjusted to estimate the causal effect.")
-            with right:
-                st.markdown("**Estimate Details**")
-                with st.expander("View full estimate output", expanded=False):
-                    st.code(res["estimate"])
-                    
-                st.markdown("**Refutation Test**")
-                if estimate_val is not None:
-                    refute_interp = _interpret_refutation(res["refute"], estimate_val, "random_common_cause")
-                    st.markdown(refute_interp)
-                with st.expander("View raw refutation output", expanded=False):
-                    st.code(res["refute"]) 
-            
-            st.caption("Powered by DoWhy. See docs at https://www.pywhy.org/dowhy/v0.13/")
+        _render_results_tab()
 
     with visuals_tab:
-        st.subheader("Visuals")
-        res = st.session_state.get("results")
-        df = st.session_state.get("df")
-        if not res or df is None:
-            st.info("Run the analysis on the Setup tab to populate visuals.")
-        else:
-            treatment = res["treatment"]
-            outcome = res["outcome"]
-            estimate_val = res.get("estimate_value")
-            if estimate_val is None:
-                est_str = res.get("estimate", "")
-                for line in est_str.split('\n'):
-                    if 'Mean value:' in line:
-                        try:
-                            estimate_val = float(line.split(':')[-1].strip())
-                            break
-                        except:
-                            pass
-            
-            ci_lower = res.get("ci_lower")
-            ci_upper = res.get("ci_upper")
-            
-            # Show estimate with CI at the top
-            if estimate_val is not None:
-                st.markdown("### 📈 Causal Effect Visualization")
-                fig1, fig2, fig3, fig_estimate = _plot_response_curves(df, treatment, outcome, estimate_val, ci_lower, ci_upper)
-                if fig_estimate:
-                    st.plotly_chart(fig_estimate, use_container_width=True)
-                    if ci_lower is not None and ci_upper is not None:
-                        st.caption(f"Error bars show 95% confidence interval: [{ci_lower:.4f}, {ci_upper:.4f}]")
-                st.markdown("---")
-            
-            st.markdown("### 📊 Data Exploration")
-            fig1, fig2, fig3, _ = _plot_response_curves(df, treatment, outcome)
-            st.plotly_chart(fig1, use_container_width=True)
-            st.caption("Scatter plot with OLS trendline showing the relationship between treatment and outcome.")
-            
-            st.plotly_chart(fig2, use_container_width=True)
-            st.caption("LOWESS (Locally Weighted Scatterplot Smoothing) shows a non-parametric response curve.")
-            
-            st.plotly_chart(fig3, use_container_width=True)
-            st.caption("Distribution of the treatment variable.")
+        _render_visuals_tab()
 
     with refute_tab:
-        st.subheader("Refutations")
-        res = st.session_state.get("results")
-        df = st.session_state.get("df")
-        if not res or df is None:
-            st.info("Run the analysis on the Setup tab to enable refutations.")
-        else:
-            treatment = res["treatment"]
-            outcome = res["outcome"]
-            confounders = res["confounders"]
-            if st.button("Run extra refuters", use_container_width=True):
-                graph, identified, estimate, refute, model = _run_dowhy(df, treatment, outcome, confounders)
-
-                # get numeric estimate value for narrative
-                estimate_val = None
-                for attr in ("value", "estimate", "causal_estimate"):
-                    if hasattr(estimate, attr):
-                        estimate_val = getattr(estimate, attr)
-                        break
-                if estimate_val is None:
-                    est_str = str(estimate)
-                    for line in est_str.split('\n'):
-                        if 'Mean value:' in line or 'ATE:' in line:
-                            try:
-                                estimate_val = float(line.split(':')[-1].strip())
-                                break
-                            except:
-                                pass
-
-                refuter_summary = []
-                
-                def run_and_display(title: str, method_name: str, refuter_type: str, method_params: dict | None = None):
-                    try:
-                        r = model.refute_estimate(identified, estimate, method_name=method_name, method_params=method_params or {})
-                        st.markdown(f"**{title}**")
-                        # Narrative
-                        if estimate_val is not None:
-                            interp = _interpret_refutation(str(r), estimate_val, refuter_type)
-                            st.markdown(interp)
-                        with st.expander("Raw output"):
-                            st.code(str(r))
-                        
-                        # Extract for summary table
-                        r_str = str(r)
-                        new_effect = None
-                        p_value = None
-                        for line in r_str.split('\n'):
-                            if 'New effect:' in line:
-                                try:
-                                    new_effect = float(line.split(':')[-1].strip())
-                                except:
-                                    pass
-                            if 'p value:' in line:
-                                try:
-                                    p_value = float(line.split(':')[-1].strip())
-                                except:
-                                    pass
-                        change_pct = None
-                        if estimate_val is not None and new_effect is not None and estimate_val != 0:
-                            change_pct = abs((new_effect - estimate_val) / estimate_val * 100)
-                        
-                        refuter_summary.append({
-                            "Refuter": title,
-                            "Original": estimate_val,
-                            "New Effect": new_effect,
-                            "Change %": change_pct,
-                            "p-value": p_value,
-                        })
-                    except Exception as e:
-                        st.warning(f"{title} skipped: {e}")
-                        refuter_summary.append({
-                            "Refuter": title,
-                            "Original": estimate_val,
-                            "New Effect": None,
-                            "Change %": None,
-                            "p-value": None,
-                            "Error": str(e),
-                        })
-
-                st.markdown("### 🔍 Robustness checks")
-                st.markdown("These tests perturb assumptions/data to check how stable the effect is. Each test checks a different aspect of robustness.")
-                run_and_display("Random common cause", "random_common_cause", "random_common_cause", {"num_simulations": 100})
-                run_and_display("Placebo treatment", "placebo_treatment_refuter", "placebo_treatment", {"placebo_type": "permute", "num_simulations": 50})
-                run_and_display("Data subset", "data_subset_refuter", "data_subset", {"subset_fraction": 0.8, "num_subsets": 10})
-                run_and_display("Bootstrap refuter", "bootstrap_refuter", "bootstrap", {"num_simulations": 200, "sample_size": int(len(df) * 0.8)})
-                
-                if refuter_summary:
-                    st.markdown("---")
-                    st.markdown("### 📊 Refutation summary")
-                    import pandas as _pd
-                    summary_df = _pd.DataFrame(refuter_summary)
-                    st.dataframe(summary_df, width="stretch")
+        _render_refute_tab()
 
 
 if __name__ == "__main__":